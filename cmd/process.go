@@ -10,6 +10,7 @@ import (
 	"sync"
 	"time"
 
+	"github.com/callumalpass/handwrite/internal/cache"
 	"github.com/callumalpass/handwrite/internal/config"
 	"github.com/callumalpass/handwrite/internal/gemini"
 	"github.com/callumalpass/handwrite/internal/processor"
@@ -19,8 +20,11 @@ import (
 )
 
 var (
-	configFile string
-	workers    int
+	configFile  string
+	workers     int
+	maxRequests int
+	noCache     bool
+	incremental bool
 )
 
 var processCmd = &cobra.Command{
@@ -37,6 +41,9 @@ Supported formats: PDF, PNG, JPG, JPEG`,
 func init() {
 	processCmd.Flags().StringVar(&configFile, "config", "", "Path to configuration file")
 	processCmd.Flags().IntVar(&workers, "workers", 4, "Number of concurrent workers")
+	processCmd.Flags().IntVar(&maxRequests, "max-requests", 8, "Maximum number of concurrent Gemini requests; each worker sends one at a time, so this only applies when --workers is larger (0 for no limit)")
+	processCmd.Flags().BoolVar(&noCache, "no-cache", false, "Ignore cached OCR results and always call Gemini")
+	processCmd.Flags().BoolVar(&incremental, "incremental", false, "Skip files whose Markdown output is newer than the input")
 }
 
 func runProcess(cmd *cobra.Command, args []string) {
@@ -65,18 +72,12 @@ func processCommand(inputPath, outputDir string) error {
 		return fmt.Errorf("failed to load config: %w", err)
 	}
 
-	// Get Gemini API key
-	apiKey, err := config.GetGeminiAPIKey()
-	if err != nil {
-		return fmt.Errorf("failed to get Gemini API key: %w", err)
-	}
-
-	// Create Gemini client
-	geminiClient, err := gemini.NewClient(apiKey, cfg.Gemini.Model)
-	if err != nil {
-		return fmt.Errorf("failed to create Gemini client: %w", err)
+	// Resolve the template path once rather than for every file
+	if !filepath.IsAbs(cfg.Template.Path) {
+		// Relative to executable directory
+		execDir, _ := os.Executable()
+		cfg.Template.Path = filepath.Join(filepath.Dir(execDir), cfg.Template.Path)
 	}
-	defer geminiClient.Close()
 
 	// Get list of input files
 	inputFiles, err := processor.GetSupportedFiles(inputPath)
@@ -88,6 +89,32 @@ func processCommand(inputPath, outputDir string) error {
 		return fmt.Errorf("no supported files found in: %s", inputPath)
 	}
 
+	if incremental {
+		pending := inputFiles[:0]
+		for _, inputFile := range inputFiles {
+			if !processor.IsUpToDate(inputFile, outputPathFor(inputFile, outputDir)) {
+				pending = append(pending, inputFile)
+			}
+		}
+
+		if skipped := len(inputFiles) - len(pending); skipped > 0 {
+			fmt.Printf("Skipping %d up-to-date file(s)\n", skipped)
+		}
+
+		inputFiles = pending
+		if len(inputFiles) == 0 {
+			fmt.Println("All files are up to date")
+			return nil
+		}
+	}
+
+	// Create the Gemini client only once there is work for it
+	geminiClient, err := newGeminiClient(cfg)
+	if err != nil {
+		return err
+	}
+	defer geminiClient.Close()
+
 	fmt.Printf("Processing %d file(s) with %d workers...\n", len(inputFiles), workers)
 
 	// Create progress bar
@@ -99,6 +126,10 @@ func processCommand(inputPath, outputDir string) error {
 	// Print results
 	fmt.Printf("\nProcessing complete:\n")
 	fmt.Printf("  Successful: %d\n", results.successful)
+	fmt.Printf("  Skipped: %d\n", len(results.skipped))
+	for _, file := range results.skipped {
+		fmt.Printf("    %s (blank page, no output written)\n", file)
+	}
 	fmt.Printf("  Failed: %d\n", results.failed)
 
 	if results.failed > 0 {
@@ -108,21 +139,79 @@ func processCommand(inputPath, outputDir string) error {
 	return nil
 }
 
+// newGeminiClient creates the Gemini client for a run and applies the request
+// limits, batching and OCR cache settings.
+func newGeminiClient(cfg *config.Config) (*gemini.Client, error) {
+	// Get Gemini API key
+	apiKey, err := config.GetGeminiAPIKey()
+	if err != nil {
+		return nil, fmt.Errorf("failed to get Gemini API key: %w", err)
+	}
+
+	// Create Gemini client
+	geminiClient, err := gemini.NewClient(apiKey, cfg.Gemini.Model)
+	if err != nil {
+		return nil, fmt.Errorf("failed to create Gemini client: %w", err)
+	}
+	geminiClient.SetMaxConcurrentRequests(maxRequests)
+	geminiClient.SetBatchSize(cfg.Gemini.BatchSize)
+
+	if cfg.Cache.Enabled && !noCache {
+		cacheDir := cfg.Cache.Dir
+		if cacheDir == "" {
+			cacheDir = cache.GetDefaultCacheDir()
+		}
+
+		ocrCache, err := cache.New(cacheDir)
+		if err != nil {
+			log.Printf("OCR cache disabled: %v", err)
+		} else {
+			geminiClient.SetCache(ocrCache)
+		}
+	}
+
+	return geminiClient, nil
+}
+
 type ProcessingResults struct {
 	successful int
+	skipped    []string
 	failed     int
 }
 
+// fileResult pairs an input file with the outcome of processing it.
+type fileResult struct {
+	path   string
+	status FileStatus
+}
+
+// FileStatus is the outcome of processing a single input file.
+type FileStatus int
+
+const (
+	FileFailed FileStatus = iota
+	FileSucceeded
+	// FileSkipped marks a file with nothing to transcribe, such as a blank page.
+	FileSkipped
+)
+
+// TextExtractor runs structured OCR on input files. It is implemented by
+// *gemini.Client.
+type TextExtractor interface {
+	ExtractStructuredTextFromPDF(ctx context.Context, pdfData []byte, prompt string) (*gemini.StructuredResponse, error)
+	ExtractStructuredTextFromBlob(ctx context.Context, data []byte, mimeType, prompt string) (*gemini.StructuredResponse, error)
+}
+
 func processFilesConcurrently(inputFiles []string, outputDir string, cfg *config.Config, geminiClient *gemini.Client, numWorkers int, bar *progressbar.ProgressBar) ProcessingResults {
 	// Create channels
 	jobs := make(chan string, len(inputFiles))
-	results := make(chan bool, len(inputFiles))
+	results := make(chan fileResult, len(inputFiles))
 
 	// Start workers
 	var wg sync.WaitGroup
 	for w := 1; w <= numWorkers; w++ {
 		wg.Add(1)
-		go worker(w, jobs, results, outputDir, cfg, geminiClient, bar, &wg)
+		go worker(w, jobs, results, outputDir, cfg, geminiClient, &wg)
 	}
 
 	// Send jobs
@@ -131,37 +220,47 @@ func processFilesConcurrently(inputFiles []string, outputDir string, cfg *config
 	}
 	close(jobs)
 
-	// Wait for workers to finish
-	wg.Wait()
-	close(results)
+	// Close results once all workers are done
+	go func() {
+		wg.Wait()
+		close(results)
+	}()
 
-	// Collect results
+	// Collect results as they arrive. This is the only goroutine that touches
+	// the progress bar, so workers never contend on it.
 	var successful, failed int
-	for success := range results {
-		if success {
+	var skipped []string
+	for result := range results {
+		switch result.status {
+		case FileSucceeded:
 			successful++
-		} else {
+		case FileSkipped:
+			skipped = append(skipped, result.path)
+		default:
 			failed++
 		}
+		_ = bar.Add(1)
 	}
 
 	return ProcessingResults{
 		successful: successful,
+		skipped:    skipped,
 		failed:     failed,
 	}
 }
 
-func worker(_ int, jobs <-chan string, results chan<- bool, outputDir string, cfg *config.Config, geminiClient *gemini.Client, bar *progressbar.ProgressBar, wg *sync.WaitGroup) {
+func worker(_ int, jobs <-chan string, results chan<- fileResult, outputDir string, cfg *config.Config, geminiClient *gemini.Client, wg *sync.WaitGroup) {
 	defer wg.Done()
 
 	for inputFile := range jobs {
-		success := processFile(inputFile, outputDir, cfg, geminiClient)
-		results <- success
-		_ = bar.Add(1)
+		results <- fileResult{path: inputFile, status: ProcessFile(inputFile, outputDir, cfg, geminiClient)}
 	}
 }
 
-func processFile(inputPath, outputDir string, cfg *config.Config, geminiClient *gemini.Client) bool {
+// ProcessFile transcribes inputPath with extractor and renders the result into
+// outputDir. No output is written for a file that fails, so that a later
+// --incremental run retries it.
+func ProcessFile(inputPath, outputDir string, cfg *config.Config, extractor TextExtractor) FileStatus {
 	ctx, cancel := context.WithTimeout(context.Background(), 5*time.Minute)
 	defer cancel()
 
@@ -175,14 +274,14 @@ func processFile(inputPath, outputDir string, cfg *config.Config, geminiClient *
 		pdfData, err := processor.GetPDFData(inputPath)
 		if err != nil {
 			log.Printf("Error reading PDF %s: %v", inputPath, err)
-			return false
+			return FileFailed
 		}
 
 		// Process entire PDF with structured OCR
-		result, err := geminiClient.ExtractStructuredTextFromPDF(ctx, pdfData.Data, cfg.Gemini.Prompt)
+		result, err := extractor.ExtractStructuredTextFromPDF(ctx, pdfData.Data, cfg.Gemini.Prompt)
 		if err != nil {
 			log.Printf("Error processing PDF %s: %v", inputPath, err)
-			return false
+			return FileFailed
 		}
 
 		fullText = result.Content
@@ -191,47 +290,37 @@ func processFile(inputPath, outputDir string, cfg *config.Config, geminiClient *
 		// Note: We don't know exact page count without parsing, but Gemini processes all pages
 	} else {
 		// Handle image files
-		images, err := processor.GetImagesFromFile(inputPath)
+		page, err := processor.LoadImagePage(inputPath, processor.Options{
+			MaxDimension:   cfg.Input.MaxDimension,
+			BlankThreshold: cfg.Input.BlankThreshold,
+		})
 		if err != nil {
 			log.Printf("Error extracting images from %s: %v", inputPath, err)
-			return false
+			return FileFailed
 		}
 
-		if len(images) == 0 {
-			log.Printf("No images found in: %s", inputPath)
-			return false
+		if page.Blank {
+			log.Printf("Skipping blank page %d of %s", page.PageNum, inputPath)
+			return FileSkipped
 		}
 
-		pageCount = len(images)
-		var pageResults []string
-		var allTags []string
-
-		// Process each image with structured OCR
-		for _, imgData := range images {
-			result, err := geminiClient.ExtractStructuredTextFromImage(ctx, imgData.Image, cfg.Gemini.Prompt)
-			if err != nil {
-				log.Printf("Error processing page %d of %s: %v", imgData.PageNum, inputPath, err)
-				pageResults = append(pageResults, fmt.Sprintf("Error processing page %d: %v", imgData.PageNum, err))
-			} else {
-				pageResults = append(pageResults, result.Content)
-				allTags = append(allTags, result.Tags...)
-			}
+		result, err := extractor.ExtractStructuredTextFromBlob(ctx, page.Data, page.MIMEType, cfg.Gemini.Prompt)
+		if err != nil {
+			log.Printf("Error processing %s: %v", inputPath, err)
+			return FileFailed
 		}
 
-		// Combine all page results and deduplicate tags
-		fullText = strings.Join(pageResults, "\n\n")
-		tags = deduplicateTags(allTags)
+		fullText = result.Content
+		tags = deduplicateTags(result.Tags)
 	}
 
 	if strings.TrimSpace(fullText) == "" {
 		log.Printf("No text extracted from: %s", inputPath)
-		return false
+		return FileFailed
 	}
 
 	// Create output filename
-	baseName := strings.TrimSuffix(filepath.Base(inputPath), filepath.Ext(inputPath))
-	outputFilename := baseName + ".md"
-	outputPath := filepath.Join(outputDir, outputFilename)
+	outputPath := outputPathFor(inputPath, outputDir)
 
 	// Create template data with structured content
 	templateData := template.CreateStructuredTemplateData(
@@ -248,19 +337,18 @@ func processFile(inputPath, outputDir string, cfg *config.Config, geminiClient *
 	log.Printf("Template data content length: %d, tags: %v", len(templateData.Content), templateData.Tags)
 
 	// Render template
-	templatePath := cfg.Template.Path
-	if !filepath.IsAbs(templatePath) {
-		// Relative to executable directory
-		execDir, _ := os.Executable()
-		templatePath = filepath.Join(filepath.Dir(execDir), templatePath)
-	}
-
-	if err := template.RenderTemplate(templatePath, outputPath, templateData); err != nil {
+	if err := template.RenderTemplate(cfg.Template.Path, outputPath, templateData); err != nil {
 		log.Printf("Error rendering template for %s: %v", inputPath, err)
-		return false
+		return FileFailed
 	}
 
-	return true
+	return FileSucceeded
+}
+
+// outputPathFor returns the Markdown file written for inputPath.
+func outputPathFor(inputPath, outputDir string) string {
+	baseName := strings.TrimSuffix(filepath.Base(inputPath), filepath.Ext(inputPath))
+	return filepath.Join(outputDir, baseName+".md")
 }
 
 func deduplicateTags(tags []string) []string {
@@ -0,0 +1,103 @@
+package cache
+
+import (
+	"crypto/sha256"
+	"encoding/hex"
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+)
+
+// keyVersion is mixed into every key so that entries can be invalidated if
+// the stored format ever changes.
+const keyVersion = "v1"
+
+// Cache is a persistent store of OCR results on disk. Each entry is a JSON
+// file named after the hash of the request that produced it.
+type Cache struct {
+	dir string
+}
+
+func GetDefaultCacheDir() string {
+	cacheDir, err := os.UserCacheDir()
+	if err != nil {
+		return ""
+	}
+	return filepath.Join(cacheDir, "handwrite", "ocr")
+}
+
+func New(dir string) (*Cache, error) {
+	if dir == "" {
+		return nil, fmt.Errorf("cache directory not set")
+	}
+
+	if err := os.MkdirAll(dir, 0755); err != nil {
+		return nil, fmt.Errorf("failed to create cache directory: %w", err)
+	}
+
+	return &Cache{dir: dir}, nil
+}
+
+// Key returns the cache key for a request with the given payload, model and
+// prompt.
+func Key(data []byte, model, prompt string) string {
+	h := sha256.New()
+	h.Write([]byte(keyVersion))
+	h.Write([]byte{0})
+	h.Write([]byte(model))
+	h.Write([]byte{0})
+	h.Write([]byte(prompt))
+	h.Write([]byte{0})
+	h.Write(data)
+	return hex.EncodeToString(h.Sum(nil))
+}
+
+// Get decodes the entry stored under key into v. It reports false if there is
+// no usable entry.
+func (c *Cache) Get(key string, v interface{}) bool {
+	data, err := os.ReadFile(c.path(key))
+	if err != nil {
+		return false
+	}
+
+	return json.Unmarshal(data, v) == nil
+}
+
+// Set stores v under key. The entry is written to a temporary file and renamed
+// into place so concurrent readers never see a partial entry.
+func (c *Cache) Set(key string, v interface{}) error {
+	data, err := json.Marshal(v)
+	if err != nil {
+		return fmt.Errorf("failed to encode cache entry: %w", err)
+	}
+
+	entryPath := c.path(key)
+	if err := os.MkdirAll(filepath.Dir(entryPath), 0755); err != nil {
+		return fmt.Errorf("failed to create cache directory: %w", err)
+	}
+
+	tmpFile, err := os.CreateTemp(filepath.Dir(entryPath), key+".*.tmp")
+	if err != nil {
+		return fmt.Errorf("failed to create cache entry: %w", err)
+	}
+	defer os.Remove(tmpFile.Name())
+
+	if _, err := tmpFile.Write(data); err != nil {
+		tmpFile.Close()
+		return fmt.Errorf("failed to write cache entry: %w", err)
+	}
+	if err := tmpFile.Close(); err != nil {
+		return fmt.Errorf("failed to write cache entry: %w", err)
+	}
+
+	if err := os.Rename(tmpFile.Name(), entryPath); err != nil {
+		return fmt.Errorf("failed to store cache entry: %w", err)
+	}
+
+	return nil
+}
+
+func (c *Cache) path(key string) string {
+	return filepath.Join(c.dir, key[:2], key+".json")
+}
@@ -11,13 +11,21 @@ import (
 
 type Config struct {
 	Gemini   GeminiConfig   `mapstructure:"gemini" yaml:"gemini"`
+	Input    InputConfig    `mapstructure:"input" yaml:"input"`
 	Template TemplateConfig `mapstructure:"template" yaml:"template"`
 	Output   OutputConfig   `mapstructure:"output" yaml:"output"`
+	Cache    CacheConfig    `mapstructure:"cache" yaml:"cache"`
 }
 
 type GeminiConfig struct {
-	Model  string `mapstructure:"model" yaml:"model"`
-	Prompt string `mapstructure:"prompt" yaml:"prompt"`
+	Model     string `mapstructure:"model" yaml:"model"`
+	Prompt    string `mapstructure:"prompt" yaml:"prompt"`
+	BatchSize int    `mapstructure:"batch_size" yaml:"batch_size"`
+}
+
+type InputConfig struct {
+	MaxDimension   int `mapstructure:"max_dimension" yaml:"max_dimension"`
+	BlankThreshold int `mapstructure:"blank_threshold" yaml:"blank_threshold"`
 }
 
 type TemplateConfig struct {
@@ -30,6 +38,11 @@ type OutputConfig struct {
 	Encoding string `mapstructure:"encoding" yaml:"encoding"`
 }
 
+type CacheConfig struct {
+	Enabled bool   `mapstructure:"enabled" yaml:"enabled"`
+	Dir     string `mapstructure:"dir" yaml:"dir"`
+}
+
 func GetDefaultConfigPath() string {
 	homeDir, err := os.UserHomeDir()
 	if err != nil {
@@ -61,6 +74,11 @@ func SetupDefaultConfig() error {
     - Transcribe the text exactly as it appears, including newlines, spacing, and paragraph breaks.
     - IMPORTANT: Preserve all line breaks and whitespace in the content field.
     - Return the response as JSON with "content" and "tags" fields.
+  batch_size: 1
+
+input:
+  max_dimension: 2048
+  blank_threshold: 0
 
 template:
   path: "templates/note_template.md"
@@ -69,6 +87,10 @@ template:
 output:
   format: "markdown"
   encoding: "utf-8"
+
+cache:
+  enabled: true
+  dir: ""
 `
 
 	if err := os.WriteFile(configPath, []byte(defaultConfig), 0600); err != nil {
@@ -82,21 +104,28 @@ func LoadConfig(configPath string) (*Config, error) {
 	// Load .env file if it exists
 	_ = godotenv.Load()
 
-	viper.SetConfigType("yaml")
+	// Use a fresh instance rather than the viper singleton so that repeated
+	// loads do not inherit keys or defaults from a previous call.
+	v := viper.New()
+	v.SetConfigType("yaml")
+	v.SetDefault("gemini.batch_size", 1)
+	v.SetDefault("input.max_dimension", 2048)
+	v.SetDefault("input.blank_threshold", 0)
+	v.SetDefault("cache.enabled", true)
 
 	if configPath != "" {
-		viper.SetConfigFile(configPath)
+		v.SetConfigFile(configPath)
 	} else {
 		defaultPath := GetDefaultConfigPath()
 		if _, err := os.Stat(defaultPath); err == nil {
-			viper.SetConfigFile(defaultPath)
+			v.SetConfigFile(defaultPath)
 		} else {
 			// Use default config if no file exists
 			return getDefaultConfig(), nil
 		}
 	}
 
-	if err := viper.ReadInConfig(); err != nil {
+	if err := v.ReadInConfig(); err != nil {
 		if _, ok := err.(viper.ConfigFileNotFoundError); ok {
 			return getDefaultConfig(), nil
 		}
@@ -104,7 +133,7 @@ func LoadConfig(configPath string) (*Config, error) {
 	}
 
 	var config Config
-	if err := viper.Unmarshal(&config); err != nil {
+	if err := v.Unmarshal(&config); err != nil {
 		return nil, fmt.Errorf("failed to unmarshal config: %w", err)
 	}
 
@@ -123,6 +152,11 @@ func getDefaultConfig() *Config {
 - Transcribe the text exactly as it appears, including newlines, spacing, and paragraph breaks.
 - IMPORTANT: Preserve all line breaks and whitespace in the content field.
 - Return the response as JSON with "content" and "tags" fields.`,
+			BatchSize: 1,
+		},
+		Input: InputConfig{
+			MaxDimension:   2048,
+			BlankThreshold: 0,
 		},
 		Template: TemplateConfig{
 			Path:      "templates/note_template.md",
@@ -132,6 +166,9 @@ func getDefaultConfig() *Config {
 			Format:   "markdown",
 			Encoding: "utf-8",
 		},
+		Cache: CacheConfig{
+			Enabled: true,
+		},
 	}
 }
 
@@ -0,0 +1,250 @@
+package gemini
+
+import (
+	"context"
+	"fmt"
+	"log"
+	"time"
+
+	"github.com/google/generative-ai-go/genai"
+)
+
+// batchWindow is how long the batcher waits for further requests before
+// sending a batch that is not yet full.
+const batchWindow = 100 * time.Millisecond
+
+// batchPromptFormat wraps the configured prompt when several images are sent
+// in a single request.
+const batchPromptFormat = `The following %d images are separate pages. Apply the instructions below to each image independently and return a JSON array containing exactly one result object per image, in the same order as the images. Set "index" in each result to the number of the image it describes.
+
+%s`
+
+type batchRequest struct {
+	ctx    context.Context
+	prompt string
+	blob   genai.Blob
+	result chan batchResult
+}
+
+type batchResult struct {
+	response *StructuredResponse
+	err      error
+}
+
+// BatchFunc sends blobs in a single request and returns one item per blob.
+// The items may be in any order; each names its image by Index.
+type BatchFunc func(ctx context.Context, prompt string, blobs []genai.Blob) ([]BatchItem, error)
+
+// SingleFunc sends one blob on its own.
+type SingleFunc func(ctx context.Context, prompt string, blob genai.Blob) (*StructuredResponse, error)
+
+// Batcher collects concurrent single-image requests and sends them to Gemini
+// together, so that several pages share one round trip. It is safe for
+// concurrent use.
+type Batcher struct {
+	size     int
+	window   time.Duration
+	batch    BatchFunc
+	single   SingleFunc
+	requests chan *batchRequest
+}
+
+// NewBatcher starts a Batcher that sends up to size requests at a time with
+// batch. A batch that is not full is sent once window has passed since its
+// first request. Requests that are alone in their batch, or whose batch fails
+// or cannot be matched to its images, are sent with single.
+func NewBatcher(size int, window time.Duration, batch BatchFunc, single SingleFunc) *Batcher {
+	b := &Batcher{
+		size:     size,
+		window:   window,
+		batch:    batch,
+		single:   single,
+		requests: make(chan *batchRequest),
+	}
+	go b.run()
+	return b
+}
+
+// Close stops the Batcher. It must not be called while Submit is in use.
+func (b *Batcher) Close() {
+	close(b.requests)
+}
+
+// Submit queues a request and waits for its result.
+func (b *Batcher) Submit(ctx context.Context, prompt string, blob genai.Blob) (*StructuredResponse, error) {
+	req := &batchRequest{
+		ctx:    ctx,
+		prompt: prompt,
+		blob:   blob,
+		result: make(chan batchResult, 1),
+	}
+
+	select {
+	case b.requests <- req:
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+
+	select {
+	case res := <-req.result:
+		return res.response, res.err
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+}
+
+func (b *Batcher) run() {
+	for first := range b.requests {
+		batch := []*batchRequest{first}
+
+		timer := time.NewTimer(b.window)
+	collect:
+		for len(batch) < b.size {
+			select {
+			case req, ok := <-b.requests:
+				if !ok {
+					break collect
+				}
+				batch = append(batch, req)
+			case <-timer.C:
+				break collect
+			}
+		}
+		timer.Stop()
+
+		// Only requests with the same prompt can share a request
+		groups := make(map[string][]*batchRequest)
+		for _, req := range batch {
+			groups[req.prompt] = append(groups[req.prompt], req)
+		}
+		for prompt, reqs := range groups {
+			go b.send(prompt, reqs)
+		}
+	}
+}
+
+// send issues one request for reqs. If the batched request fails or its
+// response cannot be matched to the images, each image is retried on its own.
+func (b *Batcher) send(prompt string, reqs []*batchRequest) {
+	if len(reqs) > 1 {
+		blobs := make([]genai.Blob, len(reqs))
+		for i, req := range reqs {
+			blobs[i] = req.blob
+		}
+
+		ctx, cancel := batchContext(reqs)
+		items, err := b.batch(ctx, prompt, blobs)
+		cancel()
+
+		var results []*StructuredResponse
+		if err == nil {
+			results, err = orderBatchItems(items, len(reqs))
+		}
+		if err == nil {
+			for i, req := range reqs {
+				req.result <- batchResult{response: results[i]}
+			}
+			return
+		}
+
+		log.Printf("Batched request for %d images failed, sending individually: %v", len(reqs), err)
+	}
+
+	for _, req := range reqs {
+		go func(req *batchRequest) {
+			response, err := b.single(req.ctx, req.prompt, req.blob)
+			req.result <- batchResult{response: response, err: err}
+		}(req)
+	}
+}
+
+// batchContext returns a context for a request made on behalf of all of reqs.
+// It is done only once every request's context is done, and its deadline is
+// the latest of theirs, so one caller giving up does not fail the others.
+func batchContext(reqs []*batchRequest) (context.Context, context.CancelFunc) {
+	var latest time.Time
+	for _, req := range reqs {
+		deadline, ok := req.ctx.Deadline()
+		if !ok {
+			latest = time.Time{}
+			break
+		}
+		if deadline.After(latest) {
+			latest = deadline
+		}
+	}
+
+	var ctx context.Context
+	var cancel context.CancelFunc
+	if latest.IsZero() {
+		ctx, cancel = context.WithCancel(context.Background())
+	} else {
+		ctx, cancel = context.WithDeadline(context.Background(), latest)
+	}
+
+	go func() {
+		for _, req := range reqs {
+			select {
+			case <-req.ctx.Done():
+			case <-ctx.Done():
+				return
+			}
+		}
+		cancel()
+	}()
+
+	return ctx, cancel
+}
+
+// generateBatch sends all blobs in one request and returns the decoded
+// results. Matching them to blobs is left to the Batcher.
+func (c *Client) generateBatch(ctx context.Context, prompt string, blobs []genai.Blob) ([]BatchItem, error) {
+	parts := make([]genai.Part, 0, 2*len(blobs)+1)
+	parts = append(parts, genai.Text(fmt.Sprintf(batchPromptFormat, len(blobs), prompt)))
+	for i, blob := range blobs {
+		parts = append(parts, genai.Text(fmt.Sprintf("Image %d:", i+1)), blob)
+	}
+
+	resp, err := c.generateContent(ctx, c.batchModel, parts...)
+	if err != nil {
+		return nil, fmt.Errorf("failed to generate content: %w", err)
+	}
+
+	var items []BatchItem
+	if err := decodeStructured(resp, &items); err != nil {
+		return nil, err
+	}
+
+	log.Printf("Extracted structured text for %d images in one request", len(items))
+	return items, nil
+}
+
+// BatchItem is one element of a batched response. Index is the one-based
+// number of the image the result describes.
+type BatchItem struct {
+	Index int `json:"index"`
+	StructuredResponse
+}
+
+// orderBatchItems matches items to the n images of a batch by their index.
+// It fails unless every image has exactly one result, so that a response that
+// drops, repeats or reorders pages is never attributed to the wrong image.
+func orderBatchItems(items []BatchItem, n int) ([]*StructuredResponse, error) {
+	if len(items) != n {
+		return nil, fmt.Errorf("expected %d results, got %d", n, len(items))
+	}
+
+	results := make([]*StructuredResponse, n)
+	for i := range items {
+		index := items[i].Index
+		if index < 1 || index > n {
+			return nil, fmt.Errorf("result has invalid image index %d", index)
+		}
+		if results[index-1] != nil {
+			return nil, fmt.Errorf("more than one result for image %d", index)
+		}
+		results[index-1] = &items[i].StructuredResponse
+	}
+
+	return results, nil
+}
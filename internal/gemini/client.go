@@ -4,26 +4,54 @@ import (
 	"bytes"
 	"context"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"image"
 	"image/jpeg"
 	"log"
+	"math/rand"
+	"net/http"
+	"strconv"
 	"strings"
+	"time"
 
+	"github.com/callumalpass/handwrite/internal/cache"
 	"github.com/google/generative-ai-go/genai"
+	"google.golang.org/api/googleapi"
 	"google.golang.org/api/option"
 )
 
+const (
+	// maxAttempts is the number of times a request is tried before giving up
+	// on transient errors.
+	maxAttempts = 5
+	// baseBackoff is the jitter ceiling for the first retry; it doubles with
+	// each further attempt up to maxBackoff.
+	baseBackoff = 1 * time.Second
+	maxBackoff  = 60 * time.Second
+)
+
 type StructuredResponse struct {
 	Content string   `json:"content"`
 	Tags    []string `json:"tags"`
 }
 
+// Client wraps a Gemini client together with a single GenerativeModel that is
+// configured once and shared by all requests. It is safe for concurrent use.
 type Client struct {
-	client *genai.Client
-	model  *genai.GenerativeModel
+	client     *genai.Client
+	model      *genai.GenerativeModel
+	batchModel *genai.GenerativeModel
+	modelName  string
+	cache      *cache.Cache
+	batcher    *Batcher
+	// sem bounds the number of in-flight requests across all callers.
+	sem chan struct{}
 }
 
+// NewClient creates the Gemini client and builds the structured-output model.
+// Callers should create one Client per run and reuse it for every page rather
+// than constructing a new model per request.
 func NewClient(apiKey string, modelName string) (*Client, error) {
 	ctx := context.Background()
 
@@ -32,11 +60,7 @@ func NewClient(apiKey string, modelName string) (*Client, error) {
 		return nil, fmt.Errorf("failed to create Gemini client: %w", err)
 	}
 
-	model := client.GenerativeModel(modelName)
-	
-	// Configure for structured JSON output
-	model.ResponseMIMEType = "application/json"
-	model.ResponseSchema = &genai.Schema{
+	structuredSchema := &genai.Schema{
 		Type: genai.TypeObject,
 		Properties: map[string]*genai.Schema{
 			"content": {Type: genai.TypeString},
@@ -48,13 +72,70 @@ func NewClient(apiKey string, modelName string) (*Client, error) {
 		Required: []string{"content", "tags"},
 	}
 
+	model := client.GenerativeModel(modelName)
+	
+	// Configure for structured JSON output
+	model.ResponseMIMEType = "application/json"
+	model.ResponseSchema = structuredSchema
+
+	// Batched requests return one structured result per image, each naming
+	// the image it belongs to
+	batchModel := client.GenerativeModel(modelName)
+	batchModel.ResponseMIMEType = "application/json"
+	batchModel.ResponseSchema = &genai.Schema{
+		Type: genai.TypeArray,
+		Items: &genai.Schema{
+			Type: genai.TypeObject,
+			Properties: map[string]*genai.Schema{
+				"index":   {Type: genai.TypeInteger},
+				"content": structuredSchema.Properties["content"],
+				"tags":    structuredSchema.Properties["tags"],
+			},
+			Required: []string{"index", "content", "tags"},
+		},
+	}
+
 	return &Client{
-		client: client,
-		model:  model,
+		client:     client,
+		model:      model,
+		batchModel: batchModel,
+		modelName:  modelName,
 	}, nil
 }
 
+// SetCache enables persistent caching of structured OCR results. Responses
+// are keyed by the uploaded data, the model name and the prompt.
+func (c *Client) SetCache(ocrCache *cache.Cache) {
+	c.cache = ocrCache
+}
+
+// SetMaxConcurrentRequests limits how many Gemini requests may be in flight at
+// once across all goroutines using the client. A value of zero or less removes
+// the limit. It must be called before the client is used.
+func (c *Client) SetMaxConcurrentRequests(n int) {
+	if n <= 0 {
+		c.sem = nil
+		return
+	}
+	c.sem = make(chan struct{}, n)
+}
+
+// SetBatchSize enables sending up to n images in a single request. Concurrent
+// calls to ExtractStructuredTextFromBlob are collected into batches; a value
+// of one or less sends every image on its own. It must be called before the
+// client is used.
+func (c *Client) SetBatchSize(n int) {
+	if n <= 1 {
+		c.batcher = nil
+		return
+	}
+	c.batcher = NewBatcher(n, batchWindow, c.generateBatch, c.generateStructured)
+}
+
 func (c *Client) Close() {
+	if c.batcher != nil {
+		c.batcher.Close()
+	}
 	if c.client != nil {
 		c.client.Close()
 	}
@@ -74,7 +155,7 @@ func (c *Client) ExtractTextFromImage(ctx context.Context, img image.Image, prom
 	}
 
 	// Generate content
-	resp, err := c.model.GenerateContent(ctx, genai.Text(prompt), blob)
+	resp, err := c.generateContent(ctx, c.model, genai.Text(prompt), blob)
 	if err != nil {
 		return "", fmt.Errorf("failed to generate content: %w", err)
 	}
@@ -102,62 +183,23 @@ func (c *Client) ExtractStructuredTextFromImage(ctx context.Context, img image.I
 		return nil, fmt.Errorf("failed to encode image: %w", err)
 	}
 
-	// Create blob from image data
-	blob := genai.Blob{
-		MIMEType: "image/jpeg",
-		Data:     buf.Bytes(),
-	}
-
-	// Generate content with JSON prompt
-	resp, err := c.model.GenerateContent(ctx, genai.Text(prompt), blob)
-	if err != nil {
-		return nil, fmt.Errorf("failed to generate content: %w", err)
-	}
-
-	if len(resp.Candidates) == 0 {
-		return nil, fmt.Errorf("no candidates returned from Gemini")
-	}
+	return c.ExtractStructuredTextFromBlob(ctx, buf.Bytes(), "image/jpeg", prompt)
+}
 
-	if len(resp.Candidates[0].Content.Parts) == 0 {
-		return nil, fmt.Errorf("no content parts returned from Gemini")
+// ExtractStructuredTextFromBlob runs structured OCR on data that has already
+// been encoded, such as a page prepared by the processor package.
+func (c *Client) ExtractStructuredTextFromBlob(ctx context.Context, data []byte, mimeType, prompt string) (*StructuredResponse, error) {
+	blob := genai.Blob{
+		MIMEType: mimeType,
+		Data:     data,
 	}
 
-	// Extract and parse JSON from the first part
-	if textPart, ok := resp.Candidates[0].Content.Parts[0].(genai.Text); ok {
-		text := string(textPart)
-		log.Printf("Raw response text: %q", text)
-		
-		// Try to extract JSON from response (handle cases where it might be wrapped in markdown)
-		jsonStr := text
-		if strings.Contains(text, "```json") {
-			// Extract JSON from markdown code block
-			start := strings.Index(text, "```json") + 7
-			end := strings.Index(text[start:], "```")
-			if end > 0 {
-				jsonStr = strings.TrimSpace(text[start : start+end])
-			}
-		} else if strings.Contains(text, "```") {
-			// Try to extract from any code block
-			start := strings.Index(text, "```") + 3
-			end := strings.Index(text[start:], "```")
-			if end > 0 {
-				jsonStr = strings.TrimSpace(text[start : start+end])
-			}
-		}
-		
-		log.Printf("Extracted JSON: %q", jsonStr)
-		
-		var result StructuredResponse
-		if err := json.Unmarshal([]byte(jsonStr), &result); err != nil {
-			log.Printf("Failed to parse JSON response: %s", jsonStr)
-			return nil, fmt.Errorf("failed to parse JSON response: %w", err)
+	return c.cachedStructured(blob.Data, prompt, func() (*StructuredResponse, error) {
+		if c.batcher != nil {
+			return c.batcher.Submit(ctx, prompt, blob)
 		}
-		
-		log.Printf("Parsed content length: %d, content preview: %q", len(result.Content), result.Content[:min(100, len(result.Content))])
-		return &result, nil
-	}
-
-	return nil, fmt.Errorf("unexpected content type returned from Gemini")
+		return c.generateStructured(ctx, prompt, blob)
+	})
 }
 
 func (c *Client) ExtractTextFromPDF(ctx context.Context, pdfData []byte, prompt string) (string, error) {
@@ -172,7 +214,7 @@ func (c *Client) ExtractTextFromPDF(ctx context.Context, pdfData []byte, prompt
 	log.Printf("Sending request to Gemini with prompt: %s", prompt[:min(50, len(prompt))])
 
 	// Generate content from the entire PDF
-	resp, err := c.model.GenerateContent(ctx, genai.Text(prompt), blob)
+	resp, err := c.generateContent(ctx, c.model, genai.Text(prompt), blob)
 	if err != nil {
 		return "", fmt.Errorf("failed to generate content: %w", err)
 	}
@@ -208,63 +250,199 @@ func (c *Client) ExtractStructuredTextFromPDF(ctx context.Context, pdfData []byt
 		Data:     pdfData,
 	}
 
-	log.Printf("Sending request to Gemini with prompt: %s", prompt[:min(50, len(prompt))])
+	return c.cachedStructured(pdfData, prompt, func() (*StructuredResponse, error) {
+		log.Printf("Sending request to Gemini with prompt: %s", prompt[:min(50, len(prompt))])
 
-	// Generate content from the entire PDF
-	resp, err := c.model.GenerateContent(ctx, genai.Text(prompt), blob)
+		result, err := c.generateStructured(ctx, prompt, blob)
+		if err != nil {
+			return nil, err
+		}
+
+		log.Printf("Extracted structured text with %d tags", len(result.Tags))
+		return result, nil
+	})
+}
+
+// cachedStructured returns the cached response for data and prompt if one
+// exists, otherwise it calls generate and stores a successful result.
+func (c *Client) cachedStructured(data []byte, prompt string, generate func() (*StructuredResponse, error)) (*StructuredResponse, error) {
+	if c.cache == nil {
+		return generate()
+	}
+
+	key := cache.Key(data, c.modelName, prompt)
+
+	var cached StructuredResponse
+	if c.cache.Get(key, &cached) {
+		log.Printf("Using cached OCR result %s", key[:12])
+		return &cached, nil
+	}
+
+	result, err := generate()
+	if err != nil {
+		return nil, err
+	}
+
+	if err := c.cache.Set(key, result); err != nil {
+		log.Printf("Failed to cache OCR result: %v", err)
+	}
+
+	return result, nil
+}
+
+// generateStructured sends prompt and blob to the structured-output model and
+// parses the JSON response.
+func (c *Client) generateStructured(ctx context.Context, prompt string, blob genai.Blob) (*StructuredResponse, error) {
+	resp, err := c.generateContent(ctx, c.model, genai.Text(prompt), blob)
 	if err != nil {
 		return nil, fmt.Errorf("failed to generate content: %w", err)
 	}
 
-	log.Printf("Received response with %d candidates", len(resp.Candidates))
+	var result StructuredResponse
+	if err := decodeStructured(resp, &result); err != nil {
+		return nil, err
+	}
 
+	log.Printf("Parsed content length: %d, content preview: %q", len(result.Content), result.Content[:min(100, len(result.Content))])
+	return &result, nil
+}
+
+// decodeStructured extracts the JSON document from the first part of resp and
+// decodes it into v.
+func decodeStructured(resp *genai.GenerateContentResponse, v interface{}) error {
 	if len(resp.Candidates) == 0 {
-		return nil, fmt.Errorf("no candidates returned from Gemini")
+		return fmt.Errorf("no candidates returned from Gemini")
 	}
 
 	if len(resp.Candidates[0].Content.Parts) == 0 {
-		return nil, fmt.Errorf("no content parts returned from Gemini")
+		return fmt.Errorf("no content parts returned from Gemini")
 	}
 
-	log.Printf("Response has %d parts", len(resp.Candidates[0].Content.Parts))
-
 	// Extract and parse JSON from the first part
-	if textPart, ok := resp.Candidates[0].Content.Parts[0].(genai.Text); ok {
-		text := string(textPart)
-		log.Printf("Raw response text: %q", text)
-		
-		// Try to extract JSON from response (handle cases where it might be wrapped in markdown)
-		jsonStr := text
-		if strings.Contains(text, "```json") {
-			// Extract JSON from markdown code block
-			start := strings.Index(text, "```json") + 7
-			end := strings.Index(text[start:], "```")
-			if end > 0 {
-				jsonStr = strings.TrimSpace(text[start : start+end])
-			}
-		} else if strings.Contains(text, "```") {
-			// Try to extract from any code block
-			start := strings.Index(text, "```") + 3
-			end := strings.Index(text[start:], "```")
-			if end > 0 {
-				jsonStr = strings.TrimSpace(text[start : start+end])
-			}
+	textPart, ok := resp.Candidates[0].Content.Parts[0].(genai.Text)
+	if !ok {
+		return fmt.Errorf("unexpected content type returned from Gemini")
+	}
+
+	text := string(textPart)
+	log.Printf("Raw response text: %q", text)
+
+	// Try to extract JSON from response (handle cases where it might be wrapped in markdown)
+	jsonStr := text
+	if strings.Contains(text, "```json") {
+		// Extract JSON from markdown code block
+		start := strings.Index(text, "```json") + 7
+		end := strings.Index(text[start:], "```")
+		if end > 0 {
+			jsonStr = strings.TrimSpace(text[start : start+end])
 		}
-		
-		log.Printf("Extracted JSON: %q", jsonStr)
-		
-		var result StructuredResponse
-		if err := json.Unmarshal([]byte(jsonStr), &result); err != nil {
-			log.Printf("Failed to parse JSON response: %s", jsonStr)
-			return nil, fmt.Errorf("failed to parse JSON response: %w", err)
+	} else if strings.Contains(text, "```") {
+		// Try to extract from any code block
+		start := strings.Index(text, "```") + 3
+		end := strings.Index(text[start:], "```")
+		if end > 0 {
+			jsonStr = strings.TrimSpace(text[start : start+end])
 		}
-		
-		log.Printf("Parsed content length: %d, content preview: %q", len(result.Content), result.Content[:min(100, len(result.Content))])
-		log.Printf("Extracted structured text with %d tags", len(result.Tags))
-		return &result, nil
 	}
 
-	return nil, fmt.Errorf("unexpected content type returned from Gemini")
+	log.Printf("Extracted JSON: %q", jsonStr)
+
+	if err := json.Unmarshal([]byte(jsonStr), v); err != nil {
+		log.Printf("Failed to parse JSON response: %s", jsonStr)
+		return fmt.Errorf("failed to parse JSON response: %w", err)
+	}
+
+	return nil
+}
+
+// generateContent calls the model, retrying rate-limit and temporary server
+// errors with exponential backoff and jitter. A request slot is held only for
+// the duration of each attempt, so backing off lets other requests proceed.
+func (c *Client) generateContent(ctx context.Context, model *genai.GenerativeModel, parts ...genai.Part) (*genai.GenerateContentResponse, error) {
+	var lastErr error
+
+	for attempt := 0; attempt < maxAttempts; attempt++ {
+		resp, err := c.generateOnce(ctx, model, parts...)
+		if err == nil {
+			return resp, nil
+		}
+
+		lastErr = err
+		if !IsRetryable(err) || attempt == maxAttempts-1 {
+			break
+		}
+
+		delay := RetryDelay(err, attempt)
+		log.Printf("Gemini request failed (attempt %d/%d), retrying in %s: %v", attempt+1, maxAttempts, delay.Round(time.Millisecond), err)
+
+		timer := time.NewTimer(delay)
+		select {
+		case <-ctx.Done():
+			timer.Stop()
+			return nil, ctx.Err()
+		case <-timer.C:
+		}
+	}
+
+	return nil, lastErr
+}
+
+func (c *Client) generateOnce(ctx context.Context, model *genai.GenerativeModel, parts ...genai.Part) (*genai.GenerateContentResponse, error) {
+	if c.sem != nil {
+		select {
+		case c.sem <- struct{}{}:
+			defer func() { <-c.sem }()
+		case <-ctx.Done():
+			return nil, ctx.Err()
+		}
+	}
+
+	return model.GenerateContent(ctx, parts...)
+}
+
+// IsRetryable reports whether err is a transient Gemini error, such as rate
+// limiting (429) or a temporary server failure, that is worth retrying.
+func IsRetryable(err error) bool {
+	var apiErr *googleapi.Error
+	if !errors.As(err, &apiErr) {
+		return false
+	}
+
+	switch apiErr.Code {
+	case http.StatusTooManyRequests,
+		http.StatusInternalServerError,
+		http.StatusBadGateway,
+		http.StatusServiceUnavailable,
+		http.StatusGatewayTimeout:
+		return true
+	}
+
+	return false
+}
+
+// RetryDelay returns how long to wait after the given zero-based failed
+// attempt. A Retry-After header sent by the server takes precedence;
+// otherwise the delay is drawn uniformly from [0, baseBackoff*2^(attempt+1)]
+// ("full jitter"), so that requests rejected together do not retry together.
+// The delay never exceeds maxBackoff.
+func RetryDelay(err error, attempt int) time.Duration {
+	var apiErr *googleapi.Error
+	if errors.As(err, &apiErr) && apiErr.Header != nil {
+		if seconds, convErr := strconv.Atoi(apiErr.Header.Get("Retry-After")); convErr == nil && seconds > 0 {
+			if delay := time.Duration(seconds) * time.Second; delay < maxBackoff {
+				return delay
+			}
+			return maxBackoff
+		}
+	}
+
+	ceiling := maxBackoff
+	if attempt < 16 && baseBackoff<<(attempt+1) < maxBackoff {
+		ceiling = baseBackoff << (attempt + 1)
+	}
+
+	//nolint:gosec // jitter does not need a cryptographically secure source
+	return time.Duration(rand.Int63n(int64(ceiling) + 1))
 }
 
 func min(a, b int) int {
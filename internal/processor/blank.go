@@ -0,0 +1,55 @@
+package processor
+
+import (
+	"image"
+	"image/color"
+	"math"
+)
+
+// blankMaxStdDev is the largest standard deviation of brightness a page may
+// have and still be considered blank.
+const blankMaxStdDev = 5.0
+
+// blankSampleSize is the number of pixels sampled along the longest side of a
+// page when checking whether it is blank.
+const blankSampleSize = 512
+
+// isBlank reports whether img is a blank page: its mean brightness is above
+// threshold and its brightness barely varies. The page is sampled on a regular
+// grid rather than read in full.
+func isBlank(img image.Image, threshold int) bool {
+	bounds := img.Bounds()
+	if bounds.Empty() {
+		return true
+	}
+
+	step := (max(bounds.Dx(), bounds.Dy()) + blankSampleSize - 1) / blankSampleSize
+
+	var samples, sum, sumSquares uint64
+	for y := bounds.Min.Y; y < bounds.Max.Y; y += step {
+		for x := bounds.Min.X; x < bounds.Max.X; x += step {
+			luma := uint64(lumaAt(img, x, y))
+			samples++
+			sum += luma
+			sumSquares += luma * luma
+		}
+	}
+
+	mean := float64(sum) / float64(samples)
+	variance := float64(sumSquares)/float64(samples) - mean*mean
+
+	return mean > float64(threshold) && math.Sqrt(math.Max(variance, 0)) < blankMaxStdDev
+}
+
+// lumaAt returns the brightness (0-255) of the pixel at x, y. For JPEG and
+// greyscale images it is read directly from the luma plane.
+func lumaAt(img image.Image, x, y int) uint8 {
+	switch src := img.(type) {
+	case *image.YCbCr:
+		return src.Y[src.YOffset(x, y)]
+	case *image.Gray:
+		return src.Pix[src.PixOffset(x, y)]
+	default:
+		return color.GrayModel.Convert(img.At(x, y)).(color.Gray).Y
+	}
+}
@@ -1,10 +1,12 @@
 package processor
 
 import (
+	"bytes"
 	"fmt"
 	"image"
 	"image/jpeg"
-	"image/png"
+	_ "image/png"
+	"io/fs"
 	"os"
 	"path/filepath"
 	"strings"
@@ -14,6 +16,24 @@ type ImageData struct {
 	Image    image.Image
 	PageNum  int
 	Filename string
+	// Data holds the encoded page ready for upload, with its MIME type. It is
+	// only set on pages produced by LoadImagePage, which releases Image once
+	// the page has been prepared.
+	Data     []byte
+	MIMEType string
+	// Blank is set by LoadImagePage on pages that are empty or nearly
+	// so. Such pages carry no upload data and need no OCR.
+	Blank bool
+}
+
+// Options controls how LoadImagePage prepares pages for upload.
+type Options struct {
+	// MaxDimension caps the longest side of an uploaded page in pixels.
+	// Larger pages are downscaled before upload. Zero disables the limit.
+	MaxDimension int
+	// BlankThreshold is the mean brightness (0-255) above which a page with
+	// almost no variation is treated as blank. Zero disables blank detection.
+	BlankThreshold int
 }
 
 type PDFData struct {
@@ -39,47 +59,115 @@ func GetPDFData(inputPath string) (*PDFData, error) {
 	}, nil
 }
 
-func GetImagesFromFile(inputPath string) ([]ImageData, error) {
+// LoadImagePage reads an image file and prepares it for upload. Files that
+// Gemini accepts as-is and that fit within opts.MaxDimension are uploaded
+// unchanged, larger ones are downscaled and encoded, and blank pages are
+// flagged so that OCR can be skipped.
+func LoadImagePage(inputPath string, opts Options) (ImageData, error) {
 	ext := strings.ToLower(filepath.Ext(inputPath))
 
 	switch ext {
 	case ".pdf":
-		return nil, fmt.Errorf("PDF files should be processed with GetPDFData")
+		return ImageData{}, fmt.Errorf("PDF files should be processed with GetPDFData")
 	case ".png", ".jpg", ".jpeg":
-		return loadImageFile(inputPath)
+		img, err := readImageFile(inputPath, opts.MaxDimension)
+		if err != nil {
+			return ImageData{}, err
+		}
+
+		page, err := preparePage(img, opts)
+		if err != nil {
+			return ImageData{}, err
+		}
+		return page, nil
 	default:
-		return nil, fmt.Errorf("unsupported file type: %s", ext)
+		return ImageData{}, fmt.Errorf("unsupported file type: %s", ext)
 	}
 }
 
-func loadImageFile(imagePath string) ([]ImageData, error) {
-	file, err := os.Open(imagePath)
-	if err != nil {
-		return nil, fmt.Errorf("failed to open image file: %w", err)
+// preparePage downscales, checks and encodes a page so that it is ready for
+// upload.
+func preparePage(img ImageData, opts Options) (ImageData, error) {
+	if img.Image == nil && opts.BlankThreshold > 0 {
+		decodedImg, _, err := image.Decode(bytes.NewReader(img.Data))
+		if err != nil {
+			return img, fmt.Errorf("failed to decode page %d: %w", img.PageNum, err)
+		}
+		img.Image = decodedImg
 	}
-	defer file.Close()
 
-	var img image.Image
-	ext := strings.ToLower(filepath.Ext(imagePath))
+	if img.Data == nil {
+		if factor := scaleFactor(img.Image.Bounds().Dx(), img.Image.Bounds().Dy(), opts.MaxDimension); factor > 1 {
+			img.Image = ShrinkImage(img.Image, factor)
+		}
+	}
 
-	switch ext {
-	case ".png":
-		img, err = png.Decode(file)
-	case ".jpg", ".jpeg":
-		img, err = jpeg.Decode(file)
-	default:
-		return nil, fmt.Errorf("unsupported image format: %s", ext)
+	if opts.BlankThreshold > 0 && isBlank(img.Image, opts.BlankThreshold) {
+		img.Blank = true
+		img.Image = nil
+		img.Data = nil
+		img.MIMEType = ""
+		return img, nil
 	}
 
+	if img.Data == nil {
+		data, err := EncodeImage(img.Image)
+		if err != nil {
+			return img, fmt.Errorf("failed to encode page %d: %w", img.PageNum, err)
+		}
+
+		img.Data = data
+		img.MIMEType = "image/jpeg"
+	}
+
+	// The upload data is all that is needed from here on
+	img.Image = nil
+	return img, nil
+}
+
+// EncodeImage encodes img as a JPEG suitable for uploading to Gemini.
+func EncodeImage(img image.Image) ([]byte, error) {
+	var buf bytes.Buffer
+	if err := jpeg.Encode(&buf, img, &jpeg.Options{Quality: 90}); err != nil {
+		return nil, err
+	}
+	return buf.Bytes(), nil
+}
+
+// readImageFile returns the raw contents of an image file together with its
+// MIME type, without decoding the pixel data. Only the header is parsed to
+// reject files that are not valid images. Images larger than maxDimension are
+// decoded instead so that they can be downscaled before upload.
+func readImageFile(imagePath string, maxDimension int) (ImageData, error) {
+	data, err := os.ReadFile(imagePath)
+	if err != nil {
+		return ImageData{}, fmt.Errorf("failed to read image file: %w", err)
+	}
+
+	imgConfig, format, err := image.DecodeConfig(bytes.NewReader(data))
 	if err != nil {
-		return nil, fmt.Errorf("failed to decode image: %w", err)
+		return ImageData{}, fmt.Errorf("failed to decode image: %w", err)
 	}
 
-	return []ImageData{{
-		Image:    img,
+	if scaleFactor(imgConfig.Width, imgConfig.Height, maxDimension) > 1 {
+		img, _, err := image.Decode(bytes.NewReader(data))
+		if err != nil {
+			return ImageData{}, fmt.Errorf("failed to decode image: %w", err)
+		}
+
+		return ImageData{
+			Image:    img,
+			PageNum:  1,
+			Filename: filepath.Base(imagePath),
+		}, nil
+	}
+
+	return ImageData{
 		PageNum:  1,
 		Filename: filepath.Base(imagePath),
-	}}, nil
+		Data:     data,
+		MIMEType: "image/" + format,
+	}, nil
 }
 
 func GetSupportedFiles(inputPath string) ([]string, error) {
@@ -98,13 +186,14 @@ func GetSupportedFiles(inputPath string) ([]string, error) {
 		return files, nil
 	}
 
-	// Directory - walk through recursively
-	err = filepath.Walk(inputPath, func(path string, info os.FileInfo, err error) error {
+	// Directory - walk through recursively. WalkDir visits every entry once,
+	// in lexical order, and avoids an extra stat per entry.
+	err = filepath.WalkDir(inputPath, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return err
 		}
 
-		if !info.IsDir() && isSupportedFile(path) {
+		if !d.IsDir() && isSupportedFile(path) {
 			files = append(files, path)
 		}
 
@@ -114,15 +203,31 @@ func GetSupportedFiles(inputPath string) ([]string, error) {
 	return files, err
 }
 
-func isSupportedFile(filename string) bool {
-	ext := strings.ToLower(filepath.Ext(filename))
-	supportedExts := []string{".pdf", ".png", ".jpg", ".jpeg"}
+// IsUpToDate reports whether outputPath exists and was modified no earlier
+// than inputPath.
+func IsUpToDate(inputPath, outputPath string) bool {
+	outputInfo, err := os.Stat(outputPath)
+	if err != nil {
+		return false
+	}
 
-	for _, supportedExt := range supportedExts {
-		if ext == supportedExt {
-			return true
-		}
+	inputInfo, err := os.Stat(inputPath)
+	if err != nil {
+		return false
 	}
 
-	return false
+	return !outputInfo.ModTime().Before(inputInfo.ModTime())
+}
+
+// supportedExts holds the lowercased extensions of files that can be processed.
+var supportedExts = map[string]struct{}{
+	".pdf":  {},
+	".png":  {},
+	".jpg":  {},
+	".jpeg": {},
+}
+
+func isSupportedFile(filename string) bool {
+	_, ok := supportedExts[strings.ToLower(filepath.Ext(filename))]
+	return ok
 }
@@ -0,0 +1,140 @@
+package processor
+
+import (
+	"image"
+	"image/color"
+	"runtime"
+	"sync"
+)
+
+// scaleFactor returns the smallest integer factor by which an image of the
+// given size must be reduced so that neither side exceeds maxDimension.
+func scaleFactor(width, height, maxDimension int) int {
+	longest := max(width, height)
+	if maxDimension <= 0 || longest <= maxDimension {
+		return 1
+	}
+	return (longest + maxDimension - 1) / maxDimension
+}
+
+// minRowsPerBand is the smallest number of output rows worth handing to a
+// separate goroutine when shrinking an image.
+const minRowsPerBand = 64
+
+// ShrinkImage reduces img by factor in each dimension, averaging each
+// factor x factor block of source pixels into one output pixel. Source rows
+// are read straight from the decoder's buffers one at a time, so the full
+// image is never copied into an intermediate RGBA buffer. Large images are
+// split into bands of output rows that are shrunk in parallel.
+func ShrinkImage(img image.Image, factor int) *image.RGBA {
+	bounds := img.Bounds()
+	srcWidth, srcHeight := bounds.Dx(), bounds.Dy()
+
+	dstWidth := (srcWidth + factor - 1) / factor
+	dstHeight := (srcHeight + factor - 1) / factor
+	dst := image.NewRGBA(image.Rect(0, 0, dstWidth, dstHeight))
+
+	bands := min(runtime.NumCPU(), (dstHeight+minRowsPerBand-1)/minRowsPerBand)
+	if bands <= 1 {
+		shrinkRows(img, dst, factor, 0, dstHeight)
+		return dst
+	}
+
+	rowsPerBand := (dstHeight + bands - 1) / bands
+	var wg sync.WaitGroup
+	for start := 0; start < dstHeight; start += rowsPerBand {
+		wg.Add(1)
+		go func(start, end int) {
+			defer wg.Done()
+			shrinkRows(img, dst, factor, start, end)
+		}(start, min(start+rowsPerBand, dstHeight))
+	}
+	wg.Wait()
+
+	return dst
+}
+
+// shrinkRows fills output rows [start, end) of dst from img.
+func shrinkRows(img image.Image, dst *image.RGBA, factor, start, end int) {
+	bounds := img.Bounds()
+	srcWidth, srcHeight := bounds.Dx(), bounds.Dy()
+	dstWidth := dst.Bounds().Dx()
+
+	row := make([]uint8, srcWidth*4)
+	sums := make([]uint32, dstWidth*4)
+
+	for y := start; y < end; y++ {
+		y0, y1 := y*factor, min((y+1)*factor, srcHeight)
+
+		clear(sums)
+		for sy := y0; sy < y1; sy++ {
+			pix := rgbaRow(img, bounds.Min.Y+sy, row)
+			for sx := 0; sx < srcWidth; sx++ {
+				s, d := sx*4, (sx/factor)*4
+				sums[d] += uint32(pix[s])
+				sums[d+1] += uint32(pix[s+1])
+				sums[d+2] += uint32(pix[s+2])
+				sums[d+3] += uint32(pix[s+3])
+			}
+		}
+
+		out := dst.Pix[dst.PixOffset(0, y):]
+		for x := 0; x < dstWidth; x++ {
+			x0, x1 := x*factor, min((x+1)*factor, srcWidth)
+			n := uint32((y1 - y0) * (x1 - x0))
+
+			d := x * 4
+			out[d] = uint8(sums[d] / n)
+			out[d+1] = uint8(sums[d+1] / n)
+			out[d+2] = uint8(sums[d+2] / n)
+			out[d+3] = uint8(sums[d+3] / n)
+		}
+	}
+}
+
+// rgbaRow returns row y of img as premultiplied 8-bit RGBA. For *image.RGBA
+// the image's own pixel buffer is returned without copying; other common
+// decoder outputs are converted into buf directly from their native layout.
+func rgbaRow(img image.Image, y int, buf []uint8) []uint8 {
+	bounds := img.Bounds()
+
+	switch src := img.(type) {
+	case *image.RGBA:
+		offset := src.PixOffset(bounds.Min.X, y)
+		return src.Pix[offset : offset+len(buf)]
+
+	case *image.Gray:
+		offset := src.PixOffset(bounds.Min.X, y)
+		for i, v := range src.Pix[offset : offset+len(buf)/4] {
+			buf[i*4], buf[i*4+1], buf[i*4+2], buf[i*4+3] = v, v, v, 0xff
+		}
+
+	case *image.YCbCr:
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			yi, ci := src.YOffset(x, y), src.COffset(x, y)
+			r, g, b := color.YCbCrToRGB(src.Y[yi], src.Cb[ci], src.Cr[ci])
+			i := (x - bounds.Min.X) * 4
+			buf[i], buf[i+1], buf[i+2], buf[i+3] = r, g, b, 0xff
+		}
+
+	case *image.NRGBA:
+		offset := src.PixOffset(bounds.Min.X, y)
+		pix := src.Pix[offset : offset+len(buf)]
+		for i := 0; i < len(pix); i += 4 {
+			a := uint32(pix[i+3])
+			buf[i] = uint8(uint32(pix[i]) * a / 0xff)
+			buf[i+1] = uint8(uint32(pix[i+1]) * a / 0xff)
+			buf[i+2] = uint8(uint32(pix[i+2]) * a / 0xff)
+			buf[i+3] = pix[i+3]
+		}
+
+	default:
+		for x := bounds.Min.X; x < bounds.Max.X; x++ {
+			r, g, b, a := img.At(x, y).RGBA()
+			i := (x - bounds.Min.X) * 4
+			buf[i], buf[i+1], buf[i+2], buf[i+3] = uint8(r>>8), uint8(g>>8), uint8(b>>8), uint8(a>>8)
+		}
+	}
+
+	return buf
+}
@@ -1,10 +1,12 @@
 package template
 
 import (
+	"bytes"
 	"fmt"
 	"os"
 	"path/filepath"
 	"strings"
+	"sync"
 	"text/template"
 	"time"
 )
@@ -23,22 +25,47 @@ type Data struct {
 	CustomVariables    map[string]interface{}
 }
 
-func RenderTemplate(templatePath, outputPath string, data Data) error {
+var (
+	parsedMu sync.Mutex
+	parsed   = make(map[string]*template.Template)
+)
+
+// loadTemplate returns the parsed template at templatePath. Templates are
+// parsed once and reused for every file rendered in the same run; edits made
+// to the file during a run take effect on the next run.
+func loadTemplate(templatePath string) (*template.Template, error) {
+	parsedMu.Lock()
+	defer parsedMu.Unlock()
+
+	if tmpl, ok := parsed[templatePath]; ok {
+		return tmpl, nil
+	}
+
 	// Check if template exists
 	if _, err := os.Stat(templatePath); os.IsNotExist(err) {
-		return fmt.Errorf("template file not found: %s", templatePath)
+		return nil, fmt.Errorf("template file not found: %s", templatePath)
 	}
 
 	// Read template file
 	tmplContent, err := os.ReadFile(templatePath)
 	if err != nil {
-		return fmt.Errorf("failed to read template file: %w", err)
+		return nil, fmt.Errorf("failed to read template file: %w", err)
 	}
 
 	// Parse template
 	tmpl, err := template.New(filepath.Base(templatePath)).Parse(string(tmplContent))
 	if err != nil {
-		return fmt.Errorf("failed to parse template: %w", err)
+		return nil, fmt.Errorf("failed to parse template: %w", err)
+	}
+
+	parsed[templatePath] = tmpl
+	return tmpl, nil
+}
+
+func RenderTemplate(templatePath, outputPath string, data Data) error {
+	tmpl, err := loadTemplate(templatePath)
+	if err != nil {
+		return err
 	}
 
 	// Create output directory if it doesn't exist
@@ -47,16 +74,18 @@ func RenderTemplate(templatePath, outputPath string, data Data) error {
 		return fmt.Errorf("failed to create output directory: %w", err)
 	}
 
-	// Create output file
-	outputFile, err := os.Create(outputPath)
-	if err != nil {
-		return fmt.Errorf("failed to create output file: %w", err)
+	// Execute template into memory so the file is written in a single call
+	// and no partial output is left behind if execution fails
+	var buf bytes.Buffer
+	buf.Grow(len(data.Content) + 1024)
+	if err := tmpl.Execute(&buf, data); err != nil {
+		return fmt.Errorf("failed to execute template: %w", err)
 	}
-	defer outputFile.Close()
 
-	// Execute template
-	if err := tmpl.Execute(outputFile, data); err != nil {
-		return fmt.Errorf("failed to execute template: %w", err)
+	// Write output file
+	//nolint:gosec // rendered notes are meant to be readable by other tools
+	if err := os.WriteFile(outputPath, buf.Bytes(), 0644); err != nil {
+		return fmt.Errorf("failed to write output file: %w", err)
 	}
 
 	return nil
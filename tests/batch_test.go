@@ -0,0 +1,226 @@
+package tests
+
+import (
+	"context"
+	"errors"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/callumalpass/handwrite/internal/gemini"
+	"github.com/google/generative-ai-go/genai"
+)
+
+// batchRecorder records the calls made by a Batcher. Each result echoes the
+// data of the blob it was produced for.
+type batchRecorder struct {
+	mu      sync.Mutex
+	batches []int
+	singles int
+}
+
+func (r *batchRecorder) batch(ctx context.Context, prompt string, blobs []genai.Blob) ([]gemini.BatchItem, error) {
+	r.mu.Lock()
+	r.batches = append(r.batches, len(blobs))
+	r.mu.Unlock()
+
+	// Return the results in reverse order to check that they are matched by index
+	items := make([]gemini.BatchItem, 0, len(blobs))
+	for i := len(blobs) - 1; i >= 0; i-- {
+		items = append(items, gemini.BatchItem{
+			Index:              i + 1,
+			StructuredResponse: gemini.StructuredResponse{Content: string(blobs[i].Data)},
+		})
+	}
+	return items, nil
+}
+
+func (r *batchRecorder) single(ctx context.Context, prompt string, blob genai.Blob) (*gemini.StructuredResponse, error) {
+	r.mu.Lock()
+	r.singles++
+	r.mu.Unlock()
+
+	return &gemini.StructuredResponse{Content: string(blob.Data)}, nil
+}
+
+// submitAll submits one blob per page concurrently and checks that each
+// caller receives the result for its own page.
+func submitAll(t *testing.T, b *gemini.Batcher, pages []string) {
+	t.Helper()
+
+	var wg sync.WaitGroup
+	for _, page := range pages {
+		wg.Add(1)
+		go func(page string) {
+			defer wg.Done()
+
+			result, err := b.Submit(context.Background(), "prompt", genai.Blob{MIMEType: "image/png", Data: []byte(page)})
+			if err != nil {
+				t.Errorf("Submit for %s failed: %v", page, err)
+				return
+			}
+			if result.Content != page {
+				t.Errorf("Expected result for %s, got %s", page, result.Content)
+			}
+		}(page)
+	}
+	wg.Wait()
+}
+
+func TestBatcher_FullBatch(t *testing.T) {
+	recorder := &batchRecorder{}
+	b := gemini.NewBatcher(3, time.Minute, recorder.batch, recorder.single)
+	defer b.Close()
+
+	done := make(chan struct{})
+	go func() {
+		submitAll(t, b, []string{"page1", "page2", "page3"})
+		close(done)
+	}()
+
+	// A full batch must be sent without waiting for the window to pass
+	select {
+	case <-done:
+	case <-time.After(5 * time.Second):
+		t.Fatal("Full batch was not sent")
+	}
+
+	if len(recorder.batches) != 1 || recorder.batches[0] != 3 {
+		t.Errorf("Expected one batch of 3, got %v", recorder.batches)
+	}
+	if recorder.singles != 0 {
+		t.Errorf("Expected no single requests, got %d", recorder.singles)
+	}
+}
+
+func TestBatcher_PartialBatchFlushesAfterWindow(t *testing.T) {
+	const window = 100 * time.Millisecond
+
+	recorder := &batchRecorder{}
+	b := gemini.NewBatcher(4, window, recorder.batch, recorder.single)
+	defer b.Close()
+
+	start := time.Now()
+	submitAll(t, b, []string{"page1", "page2"})
+	elapsed := time.Since(start)
+
+	if elapsed < window {
+		t.Errorf("Expected partial batch to wait for the %s window, sent after %s", window, elapsed)
+	}
+	if len(recorder.batches) != 1 || recorder.batches[0] != 2 {
+		t.Errorf("Expected one batch of 2, got %v", recorder.batches)
+	}
+	if recorder.singles != 0 {
+		t.Errorf("Expected no single requests, got %d", recorder.singles)
+	}
+}
+
+func TestBatcher_FallsBackToSingleRequests(t *testing.T) {
+	tests := []struct {
+		name  string
+		items []gemini.BatchItem
+		err   error
+	}{
+		{
+			name:  "Too few results",
+			items: []gemini.BatchItem{{Index: 1}},
+		},
+		{
+			name:  "Duplicate index",
+			items: []gemini.BatchItem{{Index: 1}, {Index: 1}},
+		},
+		{
+			name:  "Index out of range",
+			items: []gemini.BatchItem{{Index: 1}, {Index: 3}},
+		},
+		{
+			name: "Request failed",
+			err:  errors.New("request failed"),
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			recorder := &batchRecorder{}
+			batch := func(ctx context.Context, prompt string, blobs []genai.Blob) ([]gemini.BatchItem, error) {
+				return tt.items, tt.err
+			}
+
+			b := gemini.NewBatcher(2, time.Minute, batch, recorder.single)
+			defer b.Close()
+
+			submitAll(t, b, []string{"page1", "page2"})
+
+			if recorder.singles != 2 {
+				t.Errorf("Expected 2 single requests, got %d", recorder.singles)
+			}
+		})
+	}
+}
+
+func TestBatcher_SubmitterCancelsInFlight(t *testing.T) {
+	first := make(chan string, 1)
+	release := make(chan struct{})
+	batchErr := make(chan error, 1)
+
+	recorder := &batchRecorder{}
+	batch := func(ctx context.Context, prompt string, blobs []genai.Blob) ([]gemini.BatchItem, error) {
+		first <- string(blobs[0].Data)
+		<-release
+		batchErr <- ctx.Err()
+		return recorder.batch(ctx, prompt, blobs)
+	}
+
+	b := gemini.NewBatcher(2, time.Minute, batch, recorder.single)
+	defer b.Close()
+
+	type outcome struct {
+		result *gemini.StructuredResponse
+		err    error
+	}
+
+	pages := []string{"page1", "page2"}
+	cancels := make(map[string]context.CancelFunc)
+	outcomes := make(map[string]chan outcome)
+	for _, page := range pages {
+		ctx, cancel := context.WithCancel(context.Background())
+		defer cancel()
+
+		cancels[page] = cancel
+		outcomes[page] = make(chan outcome, 1)
+		go func(ctx context.Context, page string, out chan<- outcome) {
+			result, err := b.Submit(ctx, "prompt", genai.Blob{MIMEType: "image/png", Data: []byte(page)})
+			out <- outcome{result, err}
+		}(ctx, page, outcomes[page])
+	}
+
+	// Cancel the submitter of the first image in the batch while the request
+	// is in flight
+	cancelled := <-first
+	kept := pages[0]
+	if kept == cancelled {
+		kept = pages[1]
+	}
+	cancels[cancelled]()
+
+	if res := <-outcomes[cancelled]; !errors.Is(res.err, context.Canceled) {
+		t.Errorf("Expected cancelled submitter to return context.Canceled, got %v", res.err)
+	}
+
+	close(release)
+
+	if err := <-batchErr; err != nil {
+		t.Errorf("Expected batch to outlive one cancelled submitter, got %v", err)
+	}
+
+	res := <-outcomes[kept]
+	if res.err != nil {
+		t.Fatalf("Submit for %s failed: %v", kept, res.err)
+	}
+	if res.result.Content != kept {
+		t.Errorf("Expected result for %s, got %s", kept, res.result.Content)
+	}
+	if recorder.singles != 0 {
+		t.Errorf("Expected no single requests, got %d", recorder.singles)
+	}
+}
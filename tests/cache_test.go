@@ -0,0 +1,70 @@
+package tests
+
+import (
+	"testing"
+
+	"github.com/callumalpass/handwrite/internal/cache"
+)
+
+type cachedResult struct {
+	Content string   `json:"content"`
+	Tags    []string `json:"tags"`
+}
+
+func TestCacheSetGet(t *testing.T) {
+	c, err := cache.New(t.TempDir())
+	if err != nil {
+		t.Fatalf("Failed to create cache: %v", err)
+	}
+
+	key := cache.Key([]byte("image data"), "gemini-1.5-pro", "prompt")
+
+	var result cachedResult
+	if c.Get(key, &result) {
+		t.Fatal("Expected cache miss for new key")
+	}
+
+	expected := cachedResult{Content: "Handwritten text", Tags: []string{"#note"}}
+	if err := c.Set(key, expected); err != nil {
+		t.Fatalf("Failed to set cache entry: %v", err)
+	}
+
+	if !c.Get(key, &result) {
+		t.Fatal("Expected cache hit after Set")
+	}
+
+	if result.Content != expected.Content {
+		t.Errorf("Expected content '%s', got '%s'", expected.Content, result.Content)
+	}
+
+	if len(result.Tags) != 1 || result.Tags[0] != "#note" {
+		t.Errorf("Expected tags %v, got %v", expected.Tags, result.Tags)
+	}
+}
+
+func TestCacheKey(t *testing.T) {
+	data := []byte("image data")
+	key := cache.Key(data, "gemini-1.5-pro", "prompt")
+
+	if key != cache.Key(data, "gemini-1.5-pro", "prompt") {
+		t.Error("Expected identical requests to produce the same key")
+	}
+
+	if key == cache.Key(data, "gemini-1.5-flash", "prompt") {
+		t.Error("Expected different models to produce different keys")
+	}
+
+	if key == cache.Key(data, "gemini-1.5-pro", "other prompt") {
+		t.Error("Expected different prompts to produce different keys")
+	}
+
+	if key == cache.Key([]byte("other data"), "gemini-1.5-pro", "prompt") {
+		t.Error("Expected different data to produce different keys")
+	}
+}
+
+func TestNewCache_EmptyDir(t *testing.T) {
+	if _, err := cache.New(""); err == nil {
+		t.Error("Expected error for empty cache directory")
+	}
+}
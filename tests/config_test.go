@@ -76,3 +76,97 @@ func TestSetupDefaultConfig(t *testing.T) {
 		t.Errorf("Expected error to contain '%s', got: %v", expectedErrMsg, err)
 	}
 }
+
+// writeConfigFile writes content to a config file in dir and returns its path.
+func writeConfigFile(t *testing.T, dir, name, content string) string {
+	t.Helper()
+
+	configPath := filepath.Join(dir, name)
+	if err := os.WriteFile(configPath, []byte(content), 0644); err != nil {
+		t.Fatalf("Failed to write config file: %v", err)
+	}
+	return configPath
+}
+
+func TestLoadConfig_AppliesDefaultsForMissingSections(t *testing.T) {
+	configPath := writeConfigFile(t, t.TempDir(), "config.yaml", `gemini:
+  model: "gemini-1.5-flash"
+template:
+  path: "note.md"
+`)
+
+	cfg, err := config.LoadConfig(configPath)
+	if err != nil {
+		t.Fatalf("Failed to load config: %v", err)
+	}
+
+	if cfg.Gemini.Model != "gemini-1.5-flash" {
+		t.Errorf("Expected model 'gemini-1.5-flash', got '%s'", cfg.Gemini.Model)
+	}
+
+	if cfg.Gemini.BatchSize != 1 {
+		t.Errorf("Expected batch size 1, got %d", cfg.Gemini.BatchSize)
+	}
+
+	if cfg.Input.MaxDimension != 2048 {
+		t.Errorf("Expected max dimension 2048, got %d", cfg.Input.MaxDimension)
+	}
+
+	if cfg.Input.BlankThreshold != 0 {
+		t.Errorf("Expected blank threshold 0, got %d", cfg.Input.BlankThreshold)
+	}
+
+	if !cfg.Cache.Enabled {
+		t.Error("Expected cache to be enabled")
+	}
+}
+
+func TestLoadConfig_RepeatedLoadsAreIndependent(t *testing.T) {
+	tempDir := t.TempDir()
+	firstPath := writeConfigFile(t, tempDir, "first.yaml", `gemini:
+  model: "model-a"
+  batch_size: 3
+input:
+  blank_threshold: 200
+template:
+  path: "a.md"
+  variables:
+    author: "Author A"
+`)
+	secondPath := writeConfigFile(t, tempDir, "second.yaml", `gemini:
+  model: "model-b"
+template:
+  path: "b.md"
+`)
+
+	first, err := config.LoadConfig(firstPath)
+	if err != nil {
+		t.Fatalf("Failed to load first config: %v", err)
+	}
+
+	if first.Gemini.BatchSize != 3 || first.Input.BlankThreshold != 200 {
+		t.Fatalf("Expected first config values to be loaded, got %+v", first)
+	}
+
+	second, err := config.LoadConfig(secondPath)
+	if err != nil {
+		t.Fatalf("Failed to load second config: %v", err)
+	}
+
+	if second.Gemini.Model != "model-b" {
+		t.Errorf("Expected model 'model-b', got '%s'", second.Gemini.Model)
+	}
+
+	// Keys set only by the first file must not carry over
+	if second.Gemini.BatchSize != 1 {
+		t.Errorf("Expected batch size 1, got %d", second.Gemini.BatchSize)
+	}
+
+	if second.Input.BlankThreshold != 0 {
+		t.Errorf("Expected blank threshold 0, got %d", second.Input.BlankThreshold)
+	}
+
+	if _, ok := second.Template.Variables["author"]; ok {
+		t.Error("Expected template variables from the first config not to carry over")
+	}
+}
@@ -0,0 +1,93 @@
+package tests
+
+import (
+	"errors"
+	"fmt"
+	"net/http"
+	"testing"
+	"time"
+
+	"github.com/callumalpass/handwrite/internal/gemini"
+	"google.golang.org/api/googleapi"
+)
+
+func TestIsRetryable(t *testing.T) {
+	tests := []struct {
+		name     string
+		err      error
+		expected bool
+	}{
+		{"Rate limited", &googleapi.Error{Code: http.StatusTooManyRequests}, true},
+		{"Service unavailable", &googleapi.Error{Code: http.StatusServiceUnavailable}, true},
+		{"Internal error", &googleapi.Error{Code: http.StatusInternalServerError}, true},
+		{"Gateway timeout", &googleapi.Error{Code: http.StatusGatewayTimeout}, true},
+		{"Wrapped rate limit", fmt.Errorf("request failed: %w", &googleapi.Error{Code: http.StatusTooManyRequests}), true},
+		{"Bad request", &googleapi.Error{Code: http.StatusBadRequest}, false},
+		{"Permission denied", &googleapi.Error{Code: http.StatusForbidden}, false},
+		{"Plain error", errors.New("failed to parse JSON response"), false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := gemini.IsRetryable(tt.err); got != tt.expected {
+				t.Errorf("Expected IsRetryable to return %v, got %v", tt.expected, got)
+			}
+		})
+	}
+}
+
+func TestRetryDelay_Jitter(t *testing.T) {
+	err := &googleapi.Error{Code: http.StatusTooManyRequests}
+
+	tests := []struct {
+		attempt int
+		ceiling time.Duration
+	}{
+		{0, 2 * time.Second},
+		{1, 4 * time.Second},
+		{4, 32 * time.Second},
+		{5, 60 * time.Second},
+		{30, 60 * time.Second},
+	}
+
+	for _, tt := range tests {
+		seen := make(map[time.Duration]bool)
+		for i := 0; i < 200; i++ {
+			delay := gemini.RetryDelay(err, tt.attempt)
+			if delay < 0 || delay > tt.ceiling {
+				t.Fatalf("Attempt %d: expected delay in [0, %s], got %s", tt.attempt, tt.ceiling, delay)
+			}
+			seen[delay] = true
+		}
+
+		if len(seen) < 2 {
+			t.Errorf("Attempt %d: expected jittered delays, got the same delay every time", tt.attempt)
+		}
+	}
+}
+
+func TestRetryDelay_RetryAfter(t *testing.T) {
+	tests := []struct {
+		name       string
+		retryAfter string
+		expected   time.Duration
+	}{
+		{"Within cap", "5", 5 * time.Second},
+		{"Above cap", "120", 60 * time.Second},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			err := &googleapi.Error{
+				Code:   http.StatusTooManyRequests,
+				Header: http.Header{"Retry-After": []string{tt.retryAfter}},
+			}
+
+			for attempt := 0; attempt < 3; attempt++ {
+				if got := gemini.RetryDelay(err, attempt); got != tt.expected {
+					t.Errorf("Attempt %d: expected delay %s, got %s", attempt, tt.expected, got)
+				}
+			}
+		})
+	}
+}
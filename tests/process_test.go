@@ -0,0 +1,96 @@
+package tests
+
+import (
+	"context"
+	"errors"
+	"image"
+	"image/png"
+	"os"
+	"path/filepath"
+	"testing"
+
+	"github.com/callumalpass/handwrite/cmd"
+	"github.com/callumalpass/handwrite/internal/config"
+	"github.com/callumalpass/handwrite/internal/gemini"
+	"github.com/callumalpass/handwrite/internal/processor"
+)
+
+// fakeExtractor returns a fixed response or error for every request.
+type fakeExtractor struct {
+	response *gemini.StructuredResponse
+	err      error
+}
+
+func (f *fakeExtractor) ExtractStructuredTextFromPDF(ctx context.Context, pdfData []byte, prompt string) (*gemini.StructuredResponse, error) {
+	return f.response, f.err
+}
+
+func (f *fakeExtractor) ExtractStructuredTextFromBlob(ctx context.Context, data []byte, mimeType, prompt string) (*gemini.StructuredResponse, error) {
+	return f.response, f.err
+}
+
+func TestProcessFile(t *testing.T) {
+	tests := []struct {
+		name      string
+		extractor *fakeExtractor
+		expected  cmd.FileStatus
+		written   bool
+	}{
+		{
+			name:      "Successful OCR",
+			extractor: &fakeExtractor{response: &gemini.StructuredResponse{Content: "Hello"}},
+			expected:  cmd.FileSucceeded,
+			written:   true,
+		},
+		{
+			name:      "Failed OCR",
+			extractor: &fakeExtractor{err: errors.New("rate limited")},
+			expected:  cmd.FileFailed,
+			written:   false,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			tempDir := t.TempDir()
+			outputDir := filepath.Join(tempDir, "out")
+			if err := os.MkdirAll(outputDir, 0755); err != nil {
+				t.Fatalf("Failed to create output directory: %v", err)
+			}
+
+			templatePath := filepath.Join(tempDir, "template.md")
+			if err := os.WriteFile(templatePath, []byte("{{.Content}}"), 0644); err != nil {
+				t.Fatalf("Failed to create template file: %v", err)
+			}
+
+			inputPath := filepath.Join(tempDir, "page.png")
+			file, err := os.Create(inputPath)
+			if err != nil {
+				t.Fatalf("Failed to create image file: %v", err)
+			}
+			if err := png.Encode(file, image.NewGray(image.Rect(0, 0, 10, 10))); err != nil {
+				t.Fatalf("Failed to encode image: %v", err)
+			}
+			file.Close()
+
+			cfg := &config.Config{
+				Gemini:   config.GeminiConfig{Model: "gemini-1.5-pro", Prompt: "Transcribe"},
+				Template: config.TemplateConfig{Path: templatePath},
+			}
+
+			if status := cmd.ProcessFile(inputPath, outputDir, cfg, tt.extractor); status != tt.expected {
+				t.Errorf("Expected status %v, got %v", tt.expected, status)
+			}
+
+			outputPath := filepath.Join(outputDir, "page.md")
+			if _, err := os.Stat(outputPath); (err == nil) != tt.written {
+				t.Errorf("Expected output written=%v, got stat error %v", tt.written, err)
+			}
+
+			// A failed file must be picked up again by the next --incremental run
+			if processor.IsUpToDate(inputPath, outputPath) != tt.written {
+				t.Errorf("Expected IsUpToDate to be %v", tt.written)
+			}
+		})
+	}
+}
@@ -0,0 +1,121 @@
+package tests
+
+import (
+	"image"
+	"image/color"
+	"image/color/palette"
+	"image/draw"
+	"math/rand"
+	"testing"
+
+	"github.com/callumalpass/handwrite/internal/processor"
+)
+
+// referenceShrink converts img to RGBA with draw.Draw before shrinking, which
+// is what ShrinkImage does in a single pass for the types it reads directly.
+func referenceShrink(img image.Image, factor int) *image.RGBA {
+	bounds := img.Bounds()
+	rgba := image.NewRGBA(image.Rect(0, 0, bounds.Dx(), bounds.Dy()))
+	draw.Draw(rgba, rgba.Bounds(), img, bounds.Min, draw.Src)
+	return boxAverage(rgba, factor)
+}
+
+// boxAverage is a straightforward per-pixel box filter over an RGBA image.
+func boxAverage(src *image.RGBA, factor int) *image.RGBA {
+	width, height := src.Bounds().Dx(), src.Bounds().Dy()
+	dst := image.NewRGBA(image.Rect(0, 0, (width+factor-1)/factor, (height+factor-1)/factor))
+
+	for y := 0; y < dst.Bounds().Dy(); y++ {
+		for x := 0; x < dst.Bounds().Dx(); x++ {
+			var sum [4]int
+			n := 0
+			for sy := y * factor; sy < min((y+1)*factor, height); sy++ {
+				for sx := x * factor; sx < min((x+1)*factor, width); sx++ {
+					offset := src.PixOffset(sx, sy)
+					for c := 0; c < 4; c++ {
+						sum[c] += int(src.Pix[offset+c])
+					}
+					n++
+				}
+			}
+
+			offset := dst.PixOffset(x, y)
+			for c := 0; c < 4; c++ {
+				dst.Pix[offset+c] = uint8(sum[c] / n)
+			}
+		}
+	}
+
+	return dst
+}
+
+// randomImages returns one image of each type ShrinkImage handles, filled
+// with random pixels and placed at a non-zero origin.
+func randomImages(rect image.Rectangle) []image.Image {
+	rng := rand.New(rand.NewSource(1))
+
+	images := []image.Image{
+		image.NewRGBA(rect),
+		image.NewNRGBA(rect),
+		image.NewGray(rect),
+		image.NewPaletted(rect, palette.Plan9),
+	}
+	for _, img := range images {
+		drawable := img.(draw.Image)
+		for y := rect.Min.Y; y < rect.Max.Y; y++ {
+			for x := rect.Min.X; x < rect.Max.X; x++ {
+				drawable.Set(x, y, color.NRGBA{
+					R: uint8(rng.Intn(256)),
+					G: uint8(rng.Intn(256)),
+					B: uint8(rng.Intn(256)),
+					A: uint8(rng.Intn(256)),
+				})
+			}
+		}
+	}
+
+	ycbcr := image.NewYCbCr(rect, image.YCbCrSubsampleRatio420)
+	rng.Read(ycbcr.Y)
+	rng.Read(ycbcr.Cb)
+	rng.Read(ycbcr.Cr)
+
+	return append(images, ycbcr)
+}
+
+func TestShrinkImage_MatchesReference(t *testing.T) {
+	tests := []struct {
+		name    string
+		rect    image.Rectangle
+		factors []int
+	}{
+		{"Small", image.Rect(3, 5, 3+97, 5+61), []int{2, 3, 7}},
+		// Output is 300 rows, more than 2*minRowsPerBand, so the image is
+		// shrunk in parallel bands on multi-core machines
+		{"Tall", image.Rect(3, 5, 3+40, 5+600), []int{2}},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			testShrinkMatchesReference(t, tt.rect, tt.factors)
+		})
+	}
+}
+
+func testShrinkMatchesReference(t *testing.T, rect image.Rectangle, factors []int) {
+	for _, img := range randomImages(rect) {
+		for _, factor := range factors {
+			got := processor.ShrinkImage(img, factor)
+			want := referenceShrink(img, factor)
+
+			if got.Bounds() != want.Bounds() {
+				t.Fatalf("%T factor %d: expected bounds %v, got %v", img, factor, want.Bounds(), got.Bounds())
+			}
+
+			for i := range got.Pix {
+				if diff := int(got.Pix[i]) - int(want.Pix[i]); diff > 1 || diff < -1 {
+					t.Fatalf("%T factor %d: byte %d is %d, reference is %d", img, factor, i, got.Pix[i], want.Pix[i])
+				}
+			}
+		}
+	}
+}
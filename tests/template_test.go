@@ -47,6 +47,15 @@ func TestCreateTemplateData(t *testing.T) {
 	}
 }
 
+func TestCreateTemplateData_EscapesDelimiters(t *testing.T) {
+	data := template.CreateTemplateData("Set {{x}} and }}{{", "test.pdf", "/path/to/test.pdf", "/output", 1, "gemini-1.5-pro", nil)
+
+	expected := `Set \{\{x\}\} and \}\}\{\{`
+	if data.Content != expected {
+		t.Errorf("Expected content '%s', got '%s'", expected, data.Content)
+	}
+}
+
 func TestRenderTemplate(t *testing.T) {
 	// Create a temporary template file
 	tempDir := t.TempDir()
@@ -104,6 +113,45 @@ Model: {{.ModelUsed}}`
 	}
 }
 
+func TestRenderTemplate_Reuse(t *testing.T) {
+	tempDir := t.TempDir()
+	templatePath := filepath.Join(tempDir, "test_template.md")
+
+	if err := os.WriteFile(templatePath, []byte("# {{.Filename}}\n\n{{.Content}}"), 0644); err != nil {
+		t.Fatalf("Failed to create template file: %v", err)
+	}
+
+	for i, name := range []string{"first.pdf", "second.pdf"} {
+		if i > 0 {
+			// The template is parsed once per run, so later edits must not
+			// be picked up
+			if err := os.WriteFile(templatePath, []byte("changed {{.Filename}}"), 0644); err != nil {
+				t.Fatalf("Failed to rewrite template file: %v", err)
+			}
+		}
+
+		outputPath := filepath.Join(tempDir, name+".md")
+		data := template.Data{
+			Content:  "Content of " + name,
+			Filename: name,
+		}
+
+		if err := template.RenderTemplate(templatePath, outputPath, data); err != nil {
+			t.Fatalf("Failed to render template for %s: %v", name, err)
+		}
+
+		outputContent, err := os.ReadFile(outputPath)
+		if err != nil {
+			t.Fatalf("Failed to read output file: %v", err)
+		}
+
+		expected := "# " + name + "\n\nContent of " + name
+		if string(outputContent) != expected {
+			t.Errorf("Expected output %q, got %q", expected, string(outputContent))
+		}
+	}
+}
+
 func TestRenderTemplate_TemplateNotFound(t *testing.T) {
 	tempDir := t.TempDir()
 	templatePath := filepath.Join(tempDir, "nonexistent.md")
@@ -120,3 +168,22 @@ func TestRenderTemplate_TemplateNotFound(t *testing.T) {
 		t.Errorf("Expected 'template file not found' error, got: %v", err)
 	}
 }
+
+func TestRenderTemplate_ExecutionErrorLeavesNoOutput(t *testing.T) {
+	tempDir := t.TempDir()
+	templatePath := filepath.Join(tempDir, "broken_template.md")
+	outputPath := filepath.Join(tempDir, "output.md")
+
+	if err := os.WriteFile(templatePath, []byte("# {{.Filename}}\n{{.Missing}}"), 0644); err != nil {
+		t.Fatalf("Failed to create template file: %v", err)
+	}
+
+	err := template.RenderTemplate(templatePath, outputPath, template.Data{Filename: "test.pdf"})
+	if err == nil {
+		t.Fatal("Expected error for template referencing a missing field")
+	}
+
+	if _, err := os.Stat(outputPath); !os.IsNotExist(err) {
+		t.Error("Expected no output file after a failed render")
+	}
+}